@@ -178,9 +178,19 @@ function parseCSV(text) {
   return rows;
 }
 
+let inventoryRowsCache = { mtimeMs: -1, rows: [] };
+
+/** Parsed rows of the inventory CSV; re-read only when the file's mtime changes (e.g. after generate-inventory). */
+function loadInventoryRows() {
+  const { mtimeMs } = fs.statSync(CSV_PATH);
+  if (mtimeMs !== inventoryRowsCache.mtimeMs) {
+    inventoryRowsCache = { mtimeMs, rows: parseCSV(fs.readFileSync(CSV_PATH, 'utf-8')) };
+  }
+  return inventoryRowsCache.rows;
+}
+
 function getLatestInventorySnapshot() {
-  const csv = fs.readFileSync(CSV_PATH, 'utf-8');
-  const rows = parseCSV(csv);
+  const rows = loadInventoryRows();
   const byAsin = {};
   for (const r of rows) {
     const asin = r.asin;
@@ -196,8 +206,7 @@ function getLatestInventorySnapshot() {
 
 /** Load full CSV and return time series per product: { [asin]: [{ date, quantity_on_hand, quantity_sold }] } sorted by date. */
 function getInventoryTimeSeries(daysBack = 365) {
-  const csv = fs.readFileSync(CSV_PATH, 'utf-8');
-  const rows = parseCSV(csv);
+  const rows = loadInventoryRows();
   const byAsin = {};
   const cutoff = daysBack ? new Date(Date.now() - daysBack * 24 * 60 * 60 * 1000).toISOString().slice(0, 10) : null;
   for (const r of rows) {
@@ -531,9 +540,10 @@ Rules: Pick only from the given list. Include "link" for each item exactly as pr
     if (jsonMatch) {
       const parsed = JSON.parse(jsonMatch[0]);
       if (parsed.items?.length) {
+        const linkByAsin = new Map(list.map((r) => [r.asin, r.link]));
         parsed.items = parsed.items.map((i) => ({
           ...i,
-          link: list.find((r) => r.asin === i.asin)?.link || i.link,
+          link: linkByAsin.get(i.asin) || i.link,
         }));
       }
       if (chainLog) log('5. Grok selected', parsed.items.length, 'item(s).');
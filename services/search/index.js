@@ -10,26 +10,67 @@ const path = require('path');
 const PORT = Number(process.env.SEARCH_PORT) || 3000;
 const DATA_PATH = path.join(__dirname, '../../data', 'tech_products.json');
 const SESSION_ID = 'shop_agent';
+const TOKEN_RE = /\S{2,}/g;
+const RESULT_CACHE_MAX = 512;
 
-function search(queryStr) {
-  let products = [];
+let catalogCache = null;
+const resultCache = new Map(); // query words -> results, least recently used first
+
+/**
+ * Load tech_products.json once and index it: postings maps each whitespace token of a
+ * product's lowercased name/category/query to the indices of products containing it.
+ * Returns null on failure.
+ */
+function loadCatalog() {
+  if (catalogCache) return catalogCache;
+  let products;
   try {
     products = JSON.parse(fs.readFileSync(DATA_PATH, 'utf-8'));
   } catch (e) {
-    return [];
+    return null;
   }
-  const q = (queryStr || '').toLowerCase().trim();
-  const words = q ? q.split(/\s+/).filter((w) => w.length > 1) : [];
-  const scored = products.map((p) => {
-    const name = (p.name || '').toLowerCase();
-    const category = (p.category || '').toLowerCase();
-    const query = (p.query || '').toLowerCase();
-    const text = [name, category, query].join(' ');
-    const score = words.length ? words.filter((w) => text.includes(w)).length : 1;
-    return { score, p };
+  const postings = new Map();
+  products.forEach((p, i) => {
+    const text = [p.name || '', p.category || '', p.query || ''].join(' ').toLowerCase();
+    for (const token of new Set(text.split(/\s+/).filter(Boolean))) {
+      if (!postings.has(token)) postings.set(token, []);
+      postings.get(token).push(i);
+    }
   });
+  catalogCache = { products, postings };
+  return catalogCache;
+}
+
+function search(queryStr) {
+  const catalog = loadCatalog();
+  if (!catalog) return [];
+  const { products, postings } = catalog;
+  const words = (queryStr || '').toLowerCase().match(TOKEN_RE) || [];
+  const key = words.join(' ');
+  if (resultCache.has(key)) {
+    const cached = resultCache.get(key);
+    resultCache.delete(key);
+    resultCache.set(key, cached);
+    return cached;
+  }
+  // Score = number of query words found as a substring of the product text. Words have no
+  // whitespace, so a word matches iff it is contained in one of the product's tokens.
+  let scored;
+  if (words.length) {
+    const counts = new Map();
+    for (const w of words) {
+      const hits = new Set();
+      for (const [token, ids] of postings) {
+        if (token.includes(w)) for (const i of ids) hits.add(i);
+      }
+      for (const i of hits) counts.set(i, (counts.get(i) || 0) + 1);
+    }
+    scored = Array.from(counts, ([i, score]) => ({ score, p: products[i] }));
+  } else {
+    scored = products.map((p) => ({ score: 1, p }));
+  }
   scored.sort((a, b) => b.score - a.score || (a.p.asin > b.p.asin ? 1 : -1));
-  return scored
+  const results = scored
     .filter((x) => x.score > 0)
     .slice(0, 20)
     .map(({ p }) => ({
@@ -39,6 +80,9 @@ function search(queryStr) {
       category: p.category || '',
       link: null, // set per-request with base URL
     }));
+  resultCache.set(key, results);
+  if (resultCache.size > RESULT_CACHE_MAX) resultCache.delete(resultCache.keys().next().value);
+  return results;
 }
 
 const server = http.createServer((req, res) => {
@@ -54,11 +98,9 @@ const server = http.createServer((req, res) => {
     const results = search(query);
     const host = req.headers.host || `localhost:${PORT}`;
     const base = `http://${host}`.replace(/\/$/, '');
-    const encoded = encodeURIComponent(query || '');
-    const out = results.map((r) => ({
-      ...r,
-      link: `${base}/item_page/${SESSION_ID}/${r.asin}/${encoded}/1/{}`,
-    }));
+    const linkPrefix = `${base}/item_page/${SESSION_ID}/`;
+    const linkSuffix = `/${encodeURIComponent(query || '')}/1/{}`;
+    const out = results.map((r) => ({ ...r, link: linkPrefix + r.asin + linkSuffix }));
     res.setHeader('Content-Type', 'application/json');
     res.end(JSON.stringify({ results: out, query }));
     return;